@@ -31,10 +31,13 @@ from .roon_types import (
     RoonApiErrorResponse,
 )
 from .schema import RoonCacheData
-from .util import best_match, match_one_item
+from .util import match_one_item
 
 log = logging.getLogger(__name__)
 
+# station names like "fm 4" are also tried without the space ("fm4")
+_FM_STATION_RX = re.compile(r".*(fm \d+).*", re.IGNORECASE)
+
 
 def roon_browse(
     roonapi: RoonApi, options: RoonApiBrowseOptions
@@ -198,11 +201,10 @@ def search_genres(cache: RoonCacheData, phrase: str) -> List[EnrichedBrowseItem]
 def search_stations(cache: RoonCacheData, phrase: str) -> List[EnrichedBrowseItem]:
     """Search for radio stations."""
     opt1 = filter_hierarchy_cache(cache, phrase, ItemType.STATION)
-    pat = r".*(fm \d+).*"
-    match = re.match(pat, phrase, re.IGNORECASE)
+    match = _FM_STATION_RX.match(phrase)
     if match:
         no_whitespace = match.group(1).replace(" ", "")
-        phrase = re.sub(pat, no_whitespace, phrase, flags=re.IGNORECASE)
+        phrase = _FM_STATION_RX.sub(no_whitespace, phrase)
         opt2 = filter_hierarchy_cache(cache, phrase, ItemType.STATION)
         return opt1 + opt2
     return opt1
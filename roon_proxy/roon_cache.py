@@ -41,7 +41,7 @@ def list_(roon: RoonApi, hierarchy: HierarchyTypes) -> List[BrowseItem]:
     if isinstance(resp, RoonApiErrorResponse):
         log.info("Roon browse api returned error: %s", resp)
         return []
-    log.debug(f"Browse response: {resp}")
+    log.debug("Browse response: %s", resp)
     if resp.list.count == 0:
         return []
     load_opts = RoonApiBrowseLoadOptions(hierarchy=opts.hierarchy, count=100)
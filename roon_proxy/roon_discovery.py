@@ -121,7 +121,9 @@ class Pairing:
         if self.api:
             return
         log.info(
-            f"Starting pairing to roon core {discover_settings.host} {discover_settings.port}"
+            "Starting pairing to roon core %s %s",
+            discover_settings.host,
+            discover_settings.port,
         )
 
         self.discover_settings = discover_settings
@@ -16,7 +16,7 @@
 import json
 import logging
 import threading
-from typing import Callable, List, Optional
+from typing import Callable, Dict, List, Optional
 
 import zmq
 
@@ -45,6 +45,9 @@ from .schema import (
 
 log = logging.getLogger(__name__)
 
+# number of image urls remembered by RoonProxyClient.get_image
+_IMAGE_URL_CACHE_SIZE = 512
+
 
 class RoonPubSub:
     def __init__(self, log, ipc, address: str, cb: Callable):
@@ -76,13 +79,14 @@ class RoonPubSub:
                 break
             retries_left -= 1
             self.log.debug(
-                f"RoonPubSub response from server timed out retries_left={retries_left}"
+                "RoonPubSub response from server timed out retries_left=%d",
+                retries_left,
             )
             self.connect()
 
         if retries_left == 0:
             self.log.debug(
-                f"RoonPubSubresponse from server timed out. retries exhausted. giving up"
+                "RoonPubSub response from server timed out. retries exhausted. giving up"
             )
             self.ipc.dispatch("subscribe")
             return
@@ -108,8 +112,12 @@ class RoonProxyClient:
         self.log = log
         self.ipc = Client(address)
         self.pubsub: Optional[RoonPubSub] = None
+        # image_key -> url, the url depends only on the key and the core we are
+        # paired with
+        self._image_urls: Dict[str, str] = {}
 
     def connect(self) -> None:
+        self._image_urls.clear()
         self.ipc.connect()
         self.ipc.dispatch("connect_rpc_server")
 
@@ -123,6 +131,7 @@ class RoonProxyClient:
         return self.ipc.dispatch("discover_status")
 
     def pair(self, pair_settings: RoonManualPairSettings) -> None:
+        self._image_urls.clear()
         self.ipc.dispatch("pair", pair_settings)
 
     def pair_status(self) -> RoonPairStatus:
@@ -130,6 +139,7 @@ class RoonProxyClient:
 
     def disconnect_roon(self) -> None:
         """Ask the proxy server to disconect from roon"""
+        self._image_urls.clear()
         self.ipc.dispatch("disconnect_roon")
 
     def update_cache(self) -> RoonCacheData:
@@ -168,14 +178,12 @@ class RoonProxyClient:
 
     def search_type(self, item_type: ItemType, query: str) -> List[EnrichedBrowseItem]:
         r = self.ipc.dispatch("search_type", SearchType(item_type, query))
-        print(r)
         return r.results
 
     def search_generic(self, query: str, session_key: str) -> List[EnrichedBrowseItem]:
         r = self.ipc.dispatch(
             "search_generic", SearchGeneric(query=query, session_key=session_key)
         )
-        print(r)
         return r.results
 
     def play_path(self, zone_or_output_id: str, path: List[str]):
@@ -196,7 +204,15 @@ class RoonProxyClient:
         )
 
     def get_image(self, image_key: str) -> Optional[str]:
+        url = self._image_urls.get(image_key)
+        if url is not None:
+            return url
         r = self.ipc.dispatch("get_image", GetImageCommand(image_key=image_key))
+        if r.url is not None:
+            if len(self._image_urls) >= _IMAGE_URL_CACHE_SIZE:
+                # drop the oldest entry
+                self._image_urls.pop(next(iter(self._image_urls)), None)
+            self._image_urls[image_key] = r.url
         return r.url
 
     def now_playing_for(self, zone_id: str):
@@ -77,12 +77,14 @@ def handle_pair_result(
     if api and auth:
         roon = RoonCore(api)
         discovery = None
-        log.info(f"Paired successfully to roon core {auth.core_name} id={auth.core_id}")
+        log.info(
+            "Paired successfully to roon core %s id=%s", auth.core_name, auth.core_id
+        )
     else:
         roon = None
         discovery = Discovery()
         pairing = Pairing()
-        log.info(f"Failed to pair to a roon core")
+        log.info("Failed to pair to a roon core")
 
 
 def handle_discover_result(
@@ -91,10 +93,10 @@ def handle_discover_result(
     global discovery
     if host and port:
         discovery = None
-        log.info(f"Discovered roon core at {host} on port {port}")
+        log.info("Discovered roon core at %s on port %s", host, port)
     else:
         discovery = Discovery()
-        log.info(f"Failed to pair to a roon core")
+        log.info("Failed to pair to a roon core")
 
 
 @app.register_rpc
@@ -265,7 +267,7 @@ async def subscribe(roon: RoonCore) -> None:
 
 def main():
     sock_addr = os.environ["ROON_PROXY_SOCK"]
-    log.info(f"Starting roon proxy server at {sock_addr}")
+    log.info("Starting roon proxy server at %s", sock_addr)
     asyncio.run(app.run(sock_addr))
 
 
@@ -55,7 +55,7 @@ class RoonAuthSettings(TypedDict):
     core_name: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BrowseItemInputPrompt:
     prompt: str
     action: str
@@ -63,7 +63,7 @@ class BrowseItemInputPrompt:
     is_password: Optional[bool] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BrowseItem:
     title: str
     subtitle: Optional[str] = None
@@ -73,7 +73,7 @@ class BrowseItem:
     # input_prompt: Optional[BrowseItemInputPrompt] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BrowseList:
     title: str
     count: int
@@ -84,7 +84,7 @@ class BrowseList:
     hint: Optional[BrowseListHint] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class RoonApiBrowseOptions:
     hierarchy: HierarchyTypes
     multi_session_key: Optional[str] = None
@@ -97,20 +97,20 @@ class RoonApiBrowseOptions:
     set_display_offset: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RoonApiErrorResponse:
     message: str
     is_error: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class RoonApiBrowseResponse:
     action: str
     list: BrowseList
     item: Optional[BrowseItem] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RoonApiBrowseLoadOptions:
     hierarchy: HierarchyTypes
     multi_session_key: Optional[str] = None
@@ -120,7 +120,7 @@ class RoonApiBrowseLoadOptions:
     count: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RoonApiBrowseLoadResponse:
     items: List[BrowseItem]
     offset: int
@@ -23,7 +23,7 @@ from .roon_types import PlaybackControlOption, RepeatOption
 
 
 @register_message_type
-class RoonAuthSettings(Payload):
+class RoonAuthSettings(Payload, tag=10):
     host: str
     port: int
     token: str
@@ -32,7 +32,7 @@ class RoonAuthSettings(Payload):
 
 
 @register_message_type
-class RoonCacheData(Payload):
+class RoonCacheData(Payload, tag=11):
     last_updated: Optional[datetime]
     radio_stations: List[Any]
     genres: List[Any]
@@ -42,7 +42,7 @@ class RoonCacheData(Payload):
 
 
 @register_message_type
-class RoonManualPairSettings(Payload):
+class RoonManualPairSettings(Payload, tag=12):
     host: str
     port: int
     token: Optional[str] = None
@@ -51,63 +51,63 @@ class RoonManualPairSettings(Payload):
 
 
 @register_message_type
-class RoonDiscoverStatus(Payload):
+class RoonDiscoverStatus(Payload, tag=13):
     status: DiscoverStatus
     host: Optional[str] = None
     port: Optional[int] = None
 
 
 @register_message_type
-class RoonPairStatus(Payload):
+class RoonPairStatus(Payload, tag=14):
     status: PairingStatus
     auth: Optional[RoonAuthSettings] = None
 
 
 @register_message_type
-class MuteRequest(Payload):
+class MuteRequest(Payload, tag=15):
     output_id: str
     mute: bool
 
 
 @register_message_type
-class VolumeRelativeChange(Payload):
+class VolumeRelativeChange(Payload, tag=16):
     output_id: str
     relative_value: int
 
 
 @register_message_type
-class VolumeAbsoluteChange(Payload):
+class VolumeAbsoluteChange(Payload, tag=17):
     output_id: str
     absolute_value: int
 
 
 @register_message_type
-class Shuffle(Payload):
+class Shuffle(Payload, tag=18):
     zone_or_output_id: str
     shuffle: bool
 
 
 @register_message_type
-class Repeat(Payload):
+class Repeat(Payload, tag=19):
     zone_or_output_id: str
     repeat: RepeatOption
 
 
 @register_message_type
-class PlaybackControl(Payload):
+class PlaybackControl(Payload, tag=20):
     zone_or_output_id: str
     playback_control: PlaybackControlOption
 
 
 @register_message_type
-class PlaySearch(Payload):
+class PlaySearch(Payload, tag=21):
     zone_or_output_id: str
     item_key: Optional[str]
     session_key: str
 
 
 @register_message_type
-class PlayPath(Payload):
+class PlayPath(Payload, tag=22):
     zone_or_output_id: str
     path: List[str]
     report_error: bool = True
@@ -115,37 +115,37 @@ class PlayPath(Payload):
 
 
 @register_message_type
-class SearchType(Payload):
+class SearchType(Payload, tag=23):
     item_type: ItemType
     query: str
 
 
 @register_message_type
-class SearchGeneric(Payload):
+class SearchGeneric(Payload, tag=24):
     query: str
     session_key: str
 
 
 @register_message_type
-class SearchTypeResult(Payload):
+class SearchTypeResult(Payload, tag=25):
     results: List[EnrichedBrowseItem]
 
 
 @register_message_type
-class NowPlayingCommand(Payload):
+class NowPlayingCommand(Payload, tag=26):
     zone_id: str
 
 
 @register_message_type
-class NowPlayingReply(Payload):
+class NowPlayingReply(Payload, tag=27):
     np: Dict[str, Any]
 
 
 @register_message_type
-class GetImageCommand(Payload):
+class GetImageCommand(Payload, tag=28):
     image_key: str
 
 
 @register_message_type
-class GetImageReply(Payload):
+class GetImageReply(Payload, tag=29):
     url: Optional[str]
@@ -15,12 +15,12 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """Utils."""
 import re
-from dataclasses import asdict
-from typing import Any, Dict, List, Optional, Tuple, TypeVar, Union, cast
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple, TypeVar
 
-from fuzzywuzzy import fuzz
-from fuzzywuzzy import process as fuzz_process
-from fuzzywuzzy import utils
+from rapidfuzz import fuzz
+from rapidfuzz import process as fuzz_process
+from rapidfuzz import utils
 
 from .roon_types import BrowseItem
 
@@ -28,60 +28,70 @@ T = TypeVar("T")
 
 ConfidenceInt = Tuple[T, int]
 ConfidenceFloat = Tuple[T, float]
-ConfidenceDictFloat = Tuple[Optional[Dict[str, Any]], float]
 ConfidenceItemFloat = Tuple[Optional[BrowseItem], float]
 
-default_processor = utils.full_process
+default_processor = utils.default_process
 
+_STRIP_RX = re.compile(r"(\(.+\)|-.+)$")
 
-def expand_choices(choices, key, key2):
-    """Expand choices to include a variant with content in parens removed."""
-    new_choices = choices.copy()
-    for choice in choices:
-        orig = choice.get(key, "")
-        choice_stripped = re.sub(r"(\(.+\)|-.+)$", "", orig).strip()
-        if orig != choice_stripped:
-            choice2 = choice.copy()
-            choice2[key2] = choice_stripped
-            new_choices.append(choice2)
-    return new_choices
 
+@lru_cache(maxsize=4096)
+def strip_title(title: str) -> str:
+    """Remove trailing content in parens or after a dash from a title."""
+    return _STRIP_RX.sub("", title).strip()
 
-def key_processor(key: str, key2: str) -> Any:
-    """Process, for fuzzywuzzy, that uses the key to extract the string."""
 
-    def processor(query: Union[Dict[str, Any], str]) -> str:
-        if isinstance(query, dict):
-            if key2 in query:
-                return utils.full_process(query[key2])
-            return utils.full_process(query.get(key, ""))
-        return utils.full_process(query)
+def choice_text(choice: Any, key: str) -> str:
+    """Return the string to match on from a choice dict or dataclass."""
+    if isinstance(choice, dict):
+        return choice.get(key) or ""
+    return getattr(choice, key, None) or ""
 
-    return processor
+
+def expand_choices(choices: List[Any], key: str) -> Tuple[List[Any], List[str]]:
+    """Processed strings to match on, and the choice each string belongs to.
+
+    Every choice contributes its text, plus a variant with content in parens
+    removed when that processes to something different."""
+    texts = [choice_text(choice, key) for choice in choices]
+    owners = list(choices)
+    strings = [default_processor(text) for text in texts]
+    for i, text in enumerate(texts):
+        if "(" not in text and "-" not in text:
+            # nothing the strip pattern could remove
+            continue
+        stripped = default_processor(strip_title(text))
+        if stripped != strings[i]:
+            owners.append(choices[i])
+            strings.append(stripped)
+    return owners, strings
 
 
 def match_one(
-    query: str, choices: List[Dict[str, Any]], key: str
-) -> ConfidenceDictFloat:
-    """Match a single item from a list of choice dicts."""
-    choices = expand_choices(choices, key, "_expanded")
+    query: str,
+    choices: List[Any],
+    key: str,
+    score_cutoff: Optional[float] = None,
+) -> ConfidenceFloat[Optional[Any]]:
+    """Match a single item from a list of choice dicts or dataclasses.
+
+    Choices scoring below score_cutoff (0-100) are skipped; if nothing reaches it,
+    no match is returned."""
+    owners, strings = expand_choices(choices, key)
     try:
-        best_list = cast(
-            List[ConfidenceInt],
-            fuzz_process.extract(
-                query,
-                choices,
-                scorer=fuzz.WRatio,
-                processor=key_processor(key, "_expanded"),
-                limit=999,
-            ),
+        # the strings are processed up front, let rapidfuzz score the plain list
+        # in one call
+        best = fuzz_process.extractOne(
+            default_processor(query),
+            strings,
+            scorer=fuzz.WRatio,
+            processor=None,
+            score_cutoff=score_cutoff,
         )
-        # for b in best_list:
-        # print(f"{b[0]['title']} {b[1]}")
-        chosen, confidence = max(best_list, key=lambda i: i[1])
-        if "_expanded" in chosen:
-            del chosen["_expanded"]
-        return chosen, confidence / 100
+        if best is None:
+            return None, 0
+        _, confidence, index = best
+        return owners[index], confidence / 100
     # pylint: disable=broad-except, unused-variable, invalid-name
     except Exception as e:
         # raise e # for debugging
@@ -89,14 +99,4 @@ def match_one(
 
 
 def match_one_item(query: str, items: List[BrowseItem]) -> ConfidenceItemFloat:
-    choices = [asdict(item) for item in items]
-    item_dict, confidence = match_one(query, choices, "title")
-    if item_dict is None:
-        return None, 0
-    return BrowseItem(**item_dict), confidence
-
-
-def best_match(opt1: ConfidenceFloat, opt2: ConfidenceFloat):
-    if opt1[1] > opt2[1]:
-        return opt1
-    return opt2
+    return match_one(query, items, "title")
@@ -21,7 +21,7 @@ import os
 import random
 import re
 from functools import wraps
-from typing import Dict, List, Match, Optional, Pattern, Union, cast
+from typing import Dict, List, Match, Optional, Pattern, Tuple, Union, cast
 
 from adapt.intent import IntentBuilder
 from lingua_franca.parse import extract_number
@@ -49,44 +49,68 @@ from roon_proxy.const import (
 from roon_proxy.roon_cache import empty_roon_cache
 from roon_proxy.roon_proxy_client import RoonProxyClient
 from roon_proxy.roon_types import (
-    EVENT_OUTPUT_CHANGED,
-    EVENT_ZONE_CHANGED,
-    EVENT_ZONE_SEEK_CHANGED,
+    PlaybackControlOption,
     RoonAuthSettings,
     RoonStateChange,
 )
 from roon_proxy.schema import RoonCacheData, RoonManualPairSettings
 from roon_proxy.util import match_one
 
-from .types import (
-    OVOSAudioTrack,
-    RoonNotAuthorizedError,
-    RoonPlayData,
-    RoonSkillSettings,
-)
+from .types import OVOSAudioTrack, RoonSkillSettings
 from .util import (
+    TTLCache,
     format_duration,
     from_roon_uri,
     remove_nulls,
+    search_session_key,
     to_roon_uri,
     write_contents_if_changed,
+    zone_uri_query,
 )
 
-STATUS_KEYS = [
-    "line1",
-    "line2",
-    "currentPosition",
-    "progressValue",
-    "albumCoverUrl",
-    "duration",
-    "artistImageUrl",
-    "hasProgress"
-    "hasAlbumCover"
-    "hasArtistBlurredImage"
-    "artistBlurredImageDim"
-    "hasArtistImage"
-    "artistBlurredImageUrl",
-]
+STATUS_KEYS = frozenset(
+    [
+        "line1",
+        "line2",
+        "currentPosition",
+        "progressValue",
+        "albumCoverUrl",
+        "duration",
+        "artistImageUrl",
+        "hasProgress",
+        "hasAlbumCover",
+        "hasArtistBlurredImage",
+        "artistBlurredImageDim",
+        "hasArtistImage",
+        "artistBlurredImageUrl",
+    ]
+)
+
+# The environment is static for the lifetime of the skill, so it is only read once.
+_ROON_ENV = {
+    k: os.environ[k]
+    for k in (
+        "ROON_HOST",
+        "ROON_PORT",
+        "ROON_TOKEN",
+        "ROON_CORE_ID",
+        "ROON_CORE_NAME",
+        "ROON_PROXY_SOCK",
+        "ROON_PUBSUB_SOCK",
+    )
+    if k in os.environ
+}
+
+# Typographic quotes are normalized to their ASCII equivalents so names spoken
+# by the user match the names reported by Roon.
+_NORM_TABLE = str.maketrans(
+    {"\u2018": "'", "\u2019": "'", "\u201c": '"', "\u201d": '"'}
+)
+
+
+def norm(s: str) -> str:
+    """Normalize a zone or output name for use in entity files."""
+    return s.translate(_NORM_TABLE).lower()
 
 
 def auth_settings_valid(
@@ -115,6 +139,11 @@ def ensure_proxy_connected(method):
 
 
 def ensure_paired(method):
+    """Only run the handler once paired with a Roon core.
+
+    Handlers wrapped by this do not need to check roon_not_connected()
+    themselves."""
+
     @wraps(method)
     def wrapper(self, *args, **kwargs):
         if not self.paired:
@@ -136,6 +165,11 @@ class RoonSkill(OVOSCommonPlaybackSkill):
         self.pairing_status: PairingStatus = PairingStatus.NOT_STARTED
         self.cache: RoonCacheData = empty_roon_cache()
         self.regexes: Dict[str, Pattern] = {}
+        self._entity_hashes: Dict[str, bytes] = {}
+        self._id_index: Dict[str, Tuple[str, Dict]] = {}
+        self._search_cache = TTLCache(maxsize=128, ttl=60)
+        # ItemType name -> the named groups of its regex in searchable_regex
+        self._searchable_groups: Dict[str, List[str]] = {}
         self.watched_zone_id = None
         self.watched_artist_image_keys = None
         self.watched_artist_image_last_changed_at = None
@@ -182,10 +216,20 @@ class RoonSkill(OVOSCommonPlaybackSkill):
         settings = self.get_settings()
         proxy_addr = (
             settings.get("proxy_addr")
-            or os.environ.get("ROON_PROXY_SOCK")
+            or _ROON_ENV.get("ROON_PROXY_SOCK")
             or "ipc://server.sock"
         )
         self.roon_proxy = RoonProxyClient(self.log, proxy_addr)
+        # compile the regexes used by every search up front
+        for regex in ("OnRoon", "AtZone", "genre1", "genre2"):
+            self.regex_translate(regex)
+        self.searchable_regex = self._compile_searchable_regex()
+        # the fields shared by every track returned from a search
+        self._track_template = {
+            "media_type": MediaType.AUDIO,
+            "playback": PlaybackType.SKILL,
+            "skill_id": self.skill_id,
+        }
         self.log.info("roon init")
         # Setup handlers for playback control messages
         self.add_event("mycroft.audio.service.next", self.handle_next)
@@ -219,20 +263,22 @@ class RoonSkill(OVOSCommonPlaybackSkill):
             self.log.info("Starting roon pairing with saved settings")
             self.roon_proxy.pair(auth_opts)
             pairing_started = True
-        elif os.environ.get("ROON_HOST") and os.environ.get("ROON_TOKEN"):
+        elif _ROON_ENV.get("ROON_HOST") and _ROON_ENV.get("ROON_TOKEN"):
             # settings from env indicate a dev environment where we don't want to reload
             self.reload_skill = False
             pairing_started = True
             self.log.info(
-                f"Starting roon pairing host={settings_host} and port={settings_port}"
+                "Starting roon pairing host=%s and port=%s",
+                settings_host,
+                settings_port,
             )
             self.roon_proxy.pair(
                 RoonManualPairSettings(
-                    host=os.environ["ROON_HOST"],
-                    port=int(os.environ["ROON_PORT"]),
-                    token=os.environ["ROON_TOKEN"],
-                    core_id=os.environ["ROON_CORE_ID"],
-                    core_name=os.environ["ROON_CORE_NAME"],
+                    host=_ROON_ENV["ROON_HOST"],
+                    port=int(_ROON_ENV["ROON_PORT"]),
+                    token=_ROON_ENV["ROON_TOKEN"],
+                    core_id=_ROON_ENV["ROON_CORE_ID"],
+                    core_name=_ROON_ENV["ROON_CORE_NAME"],
                 )
             )
         elif settings_host and settings_port:
@@ -240,7 +286,9 @@ class RoonSkill(OVOSCommonPlaybackSkill):
             # but this will require authorization from the user in the Roon app
             pairing_started = True
             self.log.info(
-                f"Starting roon pairing host={settings_host} and port={settings_port}"
+                "Starting roon pairing host=%s and port=%s",
+                settings_host,
+                settings_port,
             )
             self.roon_proxy.pair(
                 RoonManualPairSettings(host=settings_host, port=settings_port)
@@ -261,7 +309,7 @@ class RoonSkill(OVOSCommonPlaybackSkill):
         return False
 
     def handle_paired(self):
-        self.log.info(f"handle_paired {self.paired} {self.pairing_status}")
+        self.log.info("handle_paired %s %s", self.paired, self.pairing_status)
         if self.paired:
             # we want to regularly check to see if we paired
             # but not so often now that we paired once
@@ -276,7 +324,7 @@ class RoonSkill(OVOSCommonPlaybackSkill):
             self.schedule_cache_update()
 
             self.roon_proxy.subscribe(
-                os.environ.get("ROON_PUBSUB_SOCK") or "ipc://pubsub.sock",
+                _ROON_ENV.get("ROON_PUBSUB_SOCK") or "ipc://pubsub.sock",
                 self.handle_roon_state_change,
             )
             self.update_library_cache()
@@ -349,38 +397,53 @@ class RoonSkill(OVOSCommonPlaybackSkill):
         """Update library cache."""
         if self.paired:
             self.cache = self.roon_proxy.update_cache()
+            self.update_id_index()
+            self._search_cache.clear()
             self.update_entities()
 
+    def update_id_index(self):
+        """Index the cached zones and outputs by their id.
+
+        Zones take precedence over outputs sharing the same id."""
+        index: Dict[str, Tuple[str, Dict]] = {
+            output_id: ("output", output)
+            for output_id, output in self.cache.outputs.items()
+        }
+        index.update(
+            (zone_id, ("zone", zone)) for zone_id, zone in self.cache.zones.items()
+        )
+        self._id_index = index
+
     def _write_entity_file(self, name: str, data: List[str]) -> None:
         """Write the entity file to the appropriate location on disk
         Only writes the file if it has changed (to prevent init loops)"""
+        contents = "\n".join(data)
+        digest = hashlib.blake2b(contents.encode("utf-8"), digest_size=16).digest()
+        if self._entity_hashes.get(name) == digest:
+            return
         file_name = f"{name}.entity"
         file_path = os.path.join(self.root_dir, "locale", self.lang, file_name)
-        was_changed = write_contents_if_changed(file_path, "\n".join(data))
+        was_changed = write_contents_if_changed(file_path, contents)
+        self._entity_hashes[name] = digest
         if was_changed:
             self.register_entity_file(f"{name}.entity")
 
     def update_entities(self):
         """Update locale entity files."""
-
-        def norm(s):
-            return s.lower().replace("’", "'")
-
-        zone_names = [
-            norm(z["display_name"])
-            for z in self.cache.zones.values()
-            if "display_name" in z
-        ]
-        self._write_entity_file("zone_name", zone_names)
-
-        output_names = [
-            norm(z["display_name"])
-            for z in self.cache.outputs.values()
-            if "display_name" in z
-        ]
-        self._write_entity_file("output_name", output_names)
-        combined = sorted(set(zone_names + output_names))
-        self._write_entity_file("zone_or_output", combined)
+        zone_names = set()
+        for zone in self.cache.zones.values():
+            display_name = zone.get("display_name")
+            if display_name:
+                zone_names.add(norm(display_name))
+        output_names = set()
+        for output in self.cache.outputs.values():
+            display_name = output.get("display_name")
+            if display_name:
+                output_names.add(norm(display_name))
+
+        self._write_entity_file("zone_name", sorted(zone_names))
+        self._write_entity_file("output_name", sorted(output_names))
+        self._write_entity_file("zone_or_output", sorted(zone_names | output_names))
 
     def debug_message(self, message, label):
         self.log.info(
@@ -407,7 +470,7 @@ class RoonSkill(OVOSCommonPlaybackSkill):
         """Get the target zone id from a user's query."""
         if isinstance(message, str):
             zone_name = message
-            self.log.debug(f"get_target_zone str {message}")
+            self.log.debug("get_target_zone str %s", message)
         else:
             zone_name = message.data.get("zone_or_output")
             # self.log.debug(
@@ -417,7 +480,7 @@ class RoonSkill(OVOSCommonPlaybackSkill):
             #    message.msg_type,
             # )
         zones = list(self.cache.zones.values())
-        zone, confidence = match_one(zone_name, zones, "display_name")
+        zone, confidence = match_one(zone_name, zones, "display_name", score_cutoff=60)
         if confidence < 0.6:
             return None
         if zone:
@@ -427,14 +490,14 @@ class RoonSkill(OVOSCommonPlaybackSkill):
                 zone["display_name"],
             )
             return zone["zone_id"]
-        self.log.info(f"no zone found from '{zone_name}'")
+        self.log.info("no zone found from '%s'", zone_name)
         return None
 
     def get_target_output(self, message: Union[str, Message]) -> Optional[str]:
         """Get the target output id from a user's query."""
         if isinstance(message, str):
             output_name = message
-            self.log.info(f"get_target_output str {message}")
+            self.log.info("get_target_output str %s", message)
         else:
             output_name = message.data.get("zone_or_output")
             # self.log.info(
@@ -445,7 +508,9 @@ class RoonSkill(OVOSCommonPlaybackSkill):
             # )
         outputs = list(self.cache.outputs.values())
         # self.log.info("outputs %s", outputs)
-        output, confidence = match_one(output_name, outputs, "display_name")
+        output, confidence = match_one(
+            output_name, outputs, "display_name", score_cutoff=60
+        )
         if confidence < 0.6:
             return None
         if output:
@@ -455,7 +520,7 @@ class RoonSkill(OVOSCommonPlaybackSkill):
                 output["display_name"],
             )
             return output["output_id"]
-        self.log.info(f"no output found from '{output_name}'")
+        self.log.info("no output found from '%s'", output_name)
         return None
 
     def get_target_zone_or_output(self, message: Union[str, Message]) -> Optional[str]:
@@ -475,15 +540,21 @@ class RoonSkill(OVOSCommonPlaybackSkill):
 
     def zone_or_output_name(self, zone_or_output_id: str) -> Optional[str]:
         """Get the zone or output name."""
-        zone = self.cache.zones.get(zone_or_output_id)
-        if zone:
-            return zone.get("display_name")
-        output = self.cache.outputs.get(zone_or_output_id)
-        self.log.info(f"OUTPUT {output}")
-        if output:
-            return output.get("display_name")
+        entry = self._id_index.get(zone_or_output_id)
+        if entry:
+            return entry[1].get("display_name")
         return None
 
+    def _resolve_outputs(self, zone_or_output_id: str) -> List[Dict]:
+        """Get the outputs belonging to a zone, or the output itself."""
+        entry = self._id_index.get(zone_or_output_id)
+        if entry is None:
+            return []
+        kind, zone_or_output = entry
+        if kind == "zone":
+            return zone_or_output["outputs"]
+        return [zone_or_output]
+
     def roon_not_connected(self, speak_error=False):
         """Check if the skill is not connected to Roon and speak an error if so"""
         if not self.paired:
@@ -510,7 +581,7 @@ class RoonSkill(OVOSCommonPlaybackSkill):
     def handle_roon_status(self, message: Message):
         # pylint: disable=unused-argument
         """Handle roon status command."""
-        self.log.info(f"handle_roon_status {self.pairing_status}")
+        self.log.info("handle_roon_status %s", self.pairing_status)
         if self.paired:
             auth = self.get_auth()
             if auth:
@@ -538,13 +609,9 @@ class RoonSkill(OVOSCommonPlaybackSkill):
         if not zone_or_output_id:
             self.speak_dialog("NoDefaultZone")
             return
-        zone = self.cache.zones.get(zone_or_output_id)
-        if zone:
-            self.speak_dialog("DefaultZone", zone)
-            return
-        output = self.cache.outputs.get(zone_or_output_id)
-        if output:
-            self.speak_dialog("DefaultZone", output)
+        entry = self._id_index.get(zone_or_output_id)
+        if entry:
+            self.speak_dialog("DefaultZone", entry[1])
             return
         default_zone_name = self.get_default_zone_name()
         self.speak_dialog("DefaultZoneNotFound", default_zone_name)
@@ -559,8 +626,6 @@ class RoonSkill(OVOSCommonPlaybackSkill):
         # pylint: disable=unused-argument
         """List available zones."""
         self.log.info("list zones")
-        if self.roon_not_connected():
-            return
         zones = self.cache.zones
         outputs = self.cache.outputs
         if len(zones) == 0 and len(outputs) == 0:
@@ -607,14 +672,14 @@ class RoonSkill(OVOSCommonPlaybackSkill):
             "display_name",
         )
         if not zone_or_output:
-            self.log.info(f"failed to match a zone for {zone_name}")
+            self.log.info("failed to match a zone for %s", zone_name)
             return
         self.log.info("zone %s conf %s", zone_or_output, conf)
         zone_or_output_id = zone_or_output.get("zone_id", None)
         if zone_or_output_id is None:
             zone_or_output_id = zone_or_output.get("output_id", None)
         if not zone_or_output_id:
-            self.log.info(f"failed to match a zone for {zone_name}")
+            self.log.info("failed to match a zone for %s", zone_name)
             return
         self.set_default_zone_id(zone_or_output_id)
         self.set_default_zone_name(zone_or_output["display_name"])
@@ -632,62 +697,46 @@ class RoonSkill(OVOSCommonPlaybackSkill):
         if self.gui:
             self.gui.release()
 
+    def _do_control(self, message: Message, control: PlaybackControlOption) -> None:
+        """Send a playback control command to the zone targeted by the message."""
+        zone_id = self.get_target_zone_or_output(message)
+        if zone_id:
+            self.roon_proxy.playback_control(zone_id, control=control)
+
     @intent_handler("Stop.intent")
     @ensure_paired
     def handle_stop(self, message: Message):
         """Stop playback."""
-        if self.roon_not_connected():
-            return
-        zone_id = self.get_target_zone_or_output(message)
-        if zone_id:
-            self.roon_proxy.playback_control(zone_id, control="stop")
+        self._do_control(message, "stop")
 
     @intent_handler("Pause.intent")
     @ensure_paired
     def handle_pause(self, message: Message):
         """Pause playback."""
-        if self.roon_not_connected():
-            return
-        zone_id = self.get_target_zone_or_output(message)
-        if zone_id:
-            self.roon_proxy.playback_control(zone_id, control="pause")
+        self._do_control(message, "pause")
 
     @intent_handler("Resume.intent")
     @ensure_paired
     def handle_resume(self, message: Message):
         """Resume playback."""
-        if self.roon_not_connected():
-            return
-        zone_id = self.get_target_zone_or_output(message)
-        if zone_id:
-            self.roon_proxy.playback_control(zone_id, control="play")
+        self._do_control(message, "play")
 
     @intent_handler("Next.intent")
     @ensure_paired
     def handle_next(self, message: Message):
         """Next playback."""
-        if self.roon_not_connected():
-            return
-        zone_id = self.get_target_zone_or_output(message)
-        if zone_id:
-            self.roon_proxy.playback_control(zone_id, control="next")
+        self._do_control(message, "next")
 
     @intent_handler("Prev.intent")
     @ensure_paired
     def handle_prev(self, message: Message):
         """Prev playback."""
-        if self.roon_not_connected():
-            return
-        zone_id = self.get_target_zone_or_output(message)
-        if zone_id:
-            self.roon_proxy.playback_control(zone_id, control="previous")
+        self._do_control(message, "previous")
 
     @intent_handler("Mute.intent")
     @ensure_paired
     def handle_mute(self, message: Message):
         """Mute playback."""
-        if self.roon_not_connected():
-            return
         zone_id = self.get_target_zone_or_output(message)
         if zone_id:
             for output in self.outputs_for_zones(zone_id):
@@ -700,8 +749,6 @@ class RoonSkill(OVOSCommonPlaybackSkill):
     @ensure_paired
     def handle_unmute(self, message: Message):
         """Unmute playback."""
-        if self.roon_not_connected():
-            return
         zone_id = self.get_target_zone_or_output(message)
         for output in self.outputs_for_zones(zone_id):
             r = self.roon_proxy.mute(output["output_id"], mute=False)
@@ -713,8 +760,6 @@ class RoonSkill(OVOSCommonPlaybackSkill):
     @ensure_paired
     def handle_volume_increase(self, message: Message):
         """Increase the volume a little bit."""
-        if self.roon_not_connected():
-            return
         zone_id = self.get_target_zone_or_output(message)
         if zone_id:
             self._step_volume(zone_id, DEFAULT_VOLUME_STEP)
@@ -724,8 +769,6 @@ class RoonSkill(OVOSCommonPlaybackSkill):
     @ensure_paired
     def handle_volume_decrease(self, message: Message):
         """Decrease the volume a little bit."""
-        if self.roon_not_connected():
-            return
         zone_id = self.get_target_zone_or_output(message)
         if zone_id:
             self._step_volume(zone_id, -DEFAULT_VOLUME_STEP)
@@ -735,26 +778,17 @@ class RoonSkill(OVOSCommonPlaybackSkill):
     @ensure_paired
     def handle_set_volume_percent(self, message: Message):
         """Set volume to a percentage."""
-        if self.roon_not_connected():
-            return
         percent = extract_number(message.data["utterance"].replace("%", ""))
         percent = int(percent)
         zone_id = self.get_target_zone_or_output(message)
         if zone_id:
-            self.log.info(f"set_vol_percent {percent} {zone_id}")
+            self.log.info("set_vol_percent %s %s", percent, zone_id)
             self._set_volume(zone_id, percent)
             self.acknowledge()
 
     def _step_volume(self, zone_or_output_id, step):
         """Change the volume by a relative step."""
-        outputs = []
-        if zone_or_output_id in self.cache.zones:
-            for output in self.outputs_for_zones(zone_or_output_id):
-                outputs.append(output)
-        elif zone_or_output_id in self.cache.outputs:
-            outputs.append(self.cache.outputs[zone_or_output_id])
-
-        for output in outputs:
+        for output in self._resolve_outputs(zone_or_output_id):
             r = self.roon_proxy.change_volume_percent(output["output_id"], step)
             self.log.info(
                 "changing step=%d output=%s output_id=%s r=%s",
@@ -766,14 +800,7 @@ class RoonSkill(OVOSCommonPlaybackSkill):
 
     def _set_volume(self, zone_or_output_id, percent):
         """Set volume to a percentage."""
-        outputs = []
-        if zone_or_output_id in self.cache.zones:
-            for output in self.outputs_for_zones(zone_or_output_id):
-                outputs.append(output)
-        elif zone_or_output_id in self.cache.outputs:
-            outputs.append(self.cache.outputs[zone_or_output_id])
-
-        for output in outputs:
+        for output in self._resolve_outputs(zone_or_output_id):
             r = self.roon_proxy.set_volume_percent(output["output_id"], percent)
             self.log.info(
                 "changing percent=%d output=%s output_id=%s r=%s",
@@ -845,12 +872,12 @@ class RoonSkill(OVOSCommonPlaybackSkill):
                     string = f.read().strip()
                 self.regexes[regex] = re.compile(string, re.IGNORECASE)
             else:
-                self.log.error(f"unknown regex {regex}")
+                self.log.error("unknown regex %s", regex)
         return self.regexes[regex]
 
     def list_capture_groups(self, match: Match) -> List[str]:
         """List the capture groups in a match."""
-        return [g for g in match.groups() if g]
+        return [g for g in match.groups() if g is not None]
 
     def regex_remove(self, phrase: str, regex_name: str) -> str:
         regex = self.regex_translate(regex_name)
@@ -858,37 +885,72 @@ class RoonSkill(OVOSCommonPlaybackSkill):
             self.log.debug(
                 "regex_remove %s: re='%s' phrase='%s'", regex_name, regex, phrase
             )
-            return re.sub(regex, "", phrase, re.IGNORECASE)
-        self.log.error(f"unknown regex {regex_name}")
+            return regex.sub("", phrase)
+        self.log.error("unknown regex %s", regex_name)
         return phrase
 
     def regex_match(self, phrase: str, regex_name: str) -> Optional[Match]:
         regex = self.regex_translate(regex_name)
         if regex:
-            return re.match(regex, phrase)
-        self.log.error(f"unknown regex {regex_name}")
+            return regex.match(phrase)
+        self.log.error("unknown regex %s", regex_name)
 
     def regex_search(self, phrase: str, regex_name: str) -> Optional[Match]:
         regex = self.regex_translate(regex_name)
         if regex:
-            return re.search(regex, phrase)
-        self.log.error(f"unknown regex {regex_name}")
+            return regex.search(phrase)
+        self.log.error("unknown regex %s", regex_name)
+
+    def _compile_searchable_regex(self) -> Pattern:
+        """Combine the searchable item type regexes into a single pattern.
+
+        Each item type becomes a lookahead anchored at the start of the phrase, so
+        the first type in ItemType.searchable order that matches anywhere in the
+        phrase wins, just as if each regex was searched for in turn. The lookahead
+        is wrapped in a group named after the ItemType, which is the lastgroup of
+        the match. The named groups of each type's regex are recorded in
+        _searchable_groups."""
+        alternatives = []
+        groups: Dict[str, List[str]] = {}
+        seen: Dict[str, str] = {item_type.name: "" for item_type in ItemType.searchable}
+        for item_type in ItemType.searchable:
+            file_name = f"{item_type.name.lower()}.regex"
+            regex = self.regex_translate(item_type.name.lower())
+            names = list(regex.groupindex)
+            if not names:
+                raise ValueError(f"{file_name} needs a named group for the query")
+            for name in names:
+                if name in seen:
+                    # the combined pattern can only hold each group name once
+                    other = seen[name] or "the combined searchable regex"
+                    raise ValueError(
+                        f"group name {name!r} in {file_name} is already used by "
+                        f"{other}, give it a name unique to the file"
+                    )
+                seen[name] = file_name
+            groups[item_type.name] = names
+            alternatives.append(f"(?P<{item_type.name}>(?=.*?(?:{regex.pattern})))")
+        self._searchable_groups = groups
+        return re.compile("|".join(alternatives), re.IGNORECASE)
 
     def _specific_query(self, phrase: str, zone_id: str) -> List[OVOSAudioTrack]:
         self.log.debug("_specific_query %s", phrase)
-        for item_type in ItemType.searchable:
-            type_name = item_type.name.lower()
-            match = self.regex_search(phrase, type_name)
-            if match:
-                phrase = " ".join(match.groupdict().values()).strip()
+        match = self.searchable_regex.match(phrase)
+        if match:
+            item_type = ItemType[match.lastgroup]
+            captures = (
+                match.group(name) for name in self._searchable_groups[item_type.name]
+            )
+            value = " ".join(c for c in captures if c is not None).strip()
+            if value:
+                phrase = value
                 self.log.debug(
                     "_specific_query matched phrase to type phrase='%s' item_type='%s'",
                     phrase,
                     item_type.name,
                 )
                 return self._query_type(item_type, phrase, zone_id)
-            else:
-                self.log.debug("_specific_query nomatch %s", type_name)
+        self.log.debug("_specific_query no item type matched")
 
         match = self.regex_match(phrase, "genre1")
         if not match:
@@ -900,32 +962,18 @@ class RoonSkill(OVOSCommonPlaybackSkill):
         return []
 
     def _browse_item_to_ovos_audio_track(
-        self, zone_id: str, item: EnrichedBrowseItem
+        self, zone_query: str, item: EnrichedBrowseItem
     ) -> Optional[OVOSAudioTrack]:
         """Convert a browse item to an ovos audio track."""
-        media_type = MediaType.AUDIO
-
-        uri = to_roon_uri(zone_id, item)
+        uri = to_roon_uri(zone_query, item)
         if not uri:
-            self.log.info(f"Failed to parse roon uri {uri}")
+            self.log.info("Failed to parse roon uri %s", uri)
             return None
-        return cast(
-            OVOSAudioTrack,
-            {
-                "match_confidence": int(item["confidence"] * 100),
-                "media_type": media_type,
-                # "length":
-                "uri": uri,
-                "playback": PlaybackType.SKILL,
-                # "image": r["image"],
-                # "bg_image": r["bg_image"],
-                # "skill_icon": self.skill_icon,
-                "title": item["title"],
-                # "artist": r["artist"],
-                # "album": r["album"],
-                "skill_id": self.skill_id,
-            },
-        )
+        track = self._track_template.copy()
+        track["match_confidence"] = int(item["confidence"] * 100)
+        track["uri"] = uri
+        track["title"] = item["title"]
+        return cast(OVOSAudioTrack, track)
 
     def _query_type(
         self, item_type: ItemType, query: str, zone_id: str
@@ -934,18 +982,18 @@ class RoonSkill(OVOSCommonPlaybackSkill):
         self.log.info("_query_type: %s", query)
         data: List[EnrichedBrowseItem] = self.roon_proxy.search_type(item_type, query)
         self.log.info("data: %s", data)
+        zone_query = zone_uri_query(zone_id)
         return remove_nulls(
-            [self._browse_item_to_ovos_audio_track(zone_id, item) for item in data]
+            self._browse_item_to_ovos_audio_track(zone_query, item) for item in data
         )
 
     def _generic_query(self, query: str, zone_id: str) -> List[OVOSAudioTrack]:
-        session_key = hashlib.md5(query.encode()).hexdigest()
+        session_key = search_session_key(query)
         found_items = self.roon_proxy.search_generic(query, session_key)
+        zone_query = zone_uri_query(zone_id)
         return remove_nulls(
-            [
-                self._browse_item_to_ovos_audio_track(zone_id, item)
-                for item in found_items
-            ]
+            self._browse_item_to_ovos_audio_track(zone_query, item)
+            for item in found_items
         )
 
     @ocp_search()
@@ -986,10 +1034,21 @@ class RoonSkill(OVOSCommonPlaybackSkill):
             self.log.error("Cannot complete search request, no zone/output found")
             return []
 
+        cache_key = (norm(phrase).strip(), zone_id)
+        results = self._search_cache.get(cache_key)
+        if results is not None:
+            self.log.info("using cached search results")
+            return [result.copy() for result in results]
         results = self._specific_query(phrase, zone_id)
         if not results:
             self.log.info("performing generic search")
             results = self._generic_query(phrase, zone_id)
+        # session uris point into the shared roon browse session, which the next
+        # search or play moves on, so only path based results stay valid
+        if results and all(
+            result["uri"].startswith("roon:///path/") for result in results
+        ):
+            self._search_cache.set(cache_key, [result.copy() for result in results])
         self.log.info("RETURNING OCP SEARCH RESULTS")
         self.log.info("%s", results)
         return results
@@ -1001,11 +1060,11 @@ class RoonSkill(OVOSCommonPlaybackSkill):
             self.gui.release()
         self.log.info("ocp_play: %s", message)
         uri = message.data["uri"]
-        self.log.debug(f"from_roon_uri({uri})")
+        self.log.debug("from_roon_uri(%s)", uri)
         play_data = from_roon_uri(uri)
         zone_or_output_id = play_data.get("zone_or_output_id")
         if not zone_or_output_id:
-            self.log.error(f"No zone or output id in uri {uri}")
+            self.log.error("No zone or output id in uri %s", uri)
             return
         if play_data["path"]:
             self.roon_proxy.play_path(zone_or_output_id, play_data["path"])
@@ -1024,12 +1083,17 @@ class RoonSkill(OVOSCommonPlaybackSkill):
         for z in updated_zones:
             zone_id = z["zone_id"]
             self.cache.zones[zone_id] = z
+            self._id_index[zone_id] = ("zone", z)
             if self.watched_zone_id == zone_id:
                 self.update_watched_zone()
         for o in updated_outputs:
-            self.cache.outputs[o["output_id"]] = o
+            output_id = o["output_id"]
+            self.cache.outputs[output_id] = o
+            if output_id not in self.cache.zones:
+                self._id_index[output_id] = ("output", o)
 
         if new_zones_found:
+            self._search_cache.clear()
             self.update_entities()
 
     def get_display_url(self) -> Optional[str]:
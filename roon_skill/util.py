@@ -12,9 +12,14 @@
 #
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import hashlib
 import os
-from typing import List, Optional, TypeVar
-from urllib.parse import parse_qs, quote, unquote, urlparse
+import string
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Hashable, Iterable, List, Optional, Tuple, TypeVar
+from urllib.parse import quote, unquote, unquote_plus
 
 from roon_proxy.const import EnrichedBrowseItem
 
@@ -22,15 +27,71 @@ from .types import RoonPlayData
 
 T = TypeVar("T")
 
+# characters quote() leaves untouched with its default safe="/"
+_SAFE_CHARS = (string.ascii_letters + string.digits + "_.-~/").encode("ascii")
 
-def remove_nulls(items: List[Optional[T]]) -> List[T]:
+
+class TTLCache:
+    """A small LRU cache whose entries expire ttl seconds after being set."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, Tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def remove_nulls(items: Iterable[Optional[T]]) -> List[T]:
     return [item for item in items if item is not None]
 
 
-def to_roon_uri(zone_id: str, item: EnrichedBrowseItem) -> Optional[str]:
+def _fast_quote(s: str) -> str:
+    # deleting every safe byte leaves nothing when there is nothing to escape
+    if s.isascii() and not s.encode("ascii").translate(None, _SAFE_CHARS):
+        return s
+    return quote(s)
+
+
+@lru_cache(maxsize=256)
+def search_session_key(query: str) -> str:
+    """Return a short, stable Roon browse session key for a search query."""
+    return hashlib.blake2b(query.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def zone_uri_query(zone_id: Optional[str]) -> str:
+    """The query string that ties a roon uri to a zone or output."""
+    if not zone_id:
+        return ""
+    return f"?zone_or_output={_fast_quote(zone_id)}"
+
+
+def to_roon_uri(zone_query: str, item: EnrichedBrowseItem) -> Optional[str]:
+    """Build a roon uri for item, zone_query comes from zone_uri_query()."""
     path = None
     if "path" in item["mycroft"] and item["mycroft"]["path"]:
-        encoded_parts = [quote(part) for part in item["mycroft"]["path"]]
+        encoded_parts = [_fast_quote(part) for part in item["mycroft"]["path"]]
         path = "/path/" + "/".join(encoded_parts)
     elif (
         "session_key" in item["mycroft"]
@@ -40,20 +101,36 @@ def to_roon_uri(zone_id: str, item: EnrichedBrowseItem) -> Optional[str]:
         path = "/session/" + item["mycroft"]["session_key"] + "/" + item["item_key"]
     if not path:
         return None
-    if zone_id:
-        path += f"?zone_or_output={quote(zone_id)}"
-    return f"roon://{path}"
+    return f"roon://{path}{zone_query}"
+
+
+def _query_value(query: str, key: str) -> Optional[str]:
+    """Return the first non-empty value of key in a query string."""
+    for pair in query.split("&"):
+        name, _, value = pair.partition("=")
+        if name == key and value:
+            if "%" in value or "+" in value:
+                return unquote_plus(value)
+            return value
+    return None
 
 
 def from_roon_uri(uri: str) -> RoonPlayData:
     if uri.startswith("roon:/"):
-        url = urlparse(uri)
-        parts = url.path.split("/")
+        rest = uri[5:]
+        if rest.startswith("//"):
+            # skip the (empty) authority
+            slash = rest.find("/", 2)
+            rest = rest[slash:] if slash != -1 else ""
+        path, _, query = rest.partition("#")[0].partition("?")
+        parts = path.split("/")
         parts.pop(0)  # first /
         play_type = parts.pop(0)  # /path or /session
-        zone_or_output = parse_qs(url.query).get("zone_or_output", [None])[0]
+        zone_or_output = _query_value(query, "zone_or_output")
         if play_type == "path":
-            decoded_parts = [unquote(part) for part in parts if part]
+            decoded_parts = [
+                unquote(part) if "%" in part else part for part in parts if part
+            ]
             return RoonPlayData(
                 path=decoded_parts,
                 zone_or_output_id=zone_or_output,
@@ -73,27 +150,36 @@ def from_roon_uri(uri: str) -> RoonPlayData:
 
 
 def write_contents_if_changed(file_path: str, contents: str) -> bool:
-    if os.path.exists(file_path):
-        with open(file_path, "r", encoding="utf-8") as f:
-            existing_content = f.read()
-    else:
-        existing_content = None
+    """Write contents to file_path unless the file already holds exactly that.
+
+    Returns True if the file was written."""
+    new_content = contents.encode("utf-8")
+    try:
+        same_size = os.stat(file_path).st_size == len(new_content)
+    except FileNotFoundError:
+        same_size = False
 
-    new_content = "\n".join(contents)
+    if same_size:
+        with open(file_path, "rb") as f:
+            if f.read() == new_content:
+                return False
 
-    if existing_content != new_content:
-        with open(file_path, "w+", encoding="utf-8") as f:
-            f.write(new_content)
-        return True
-    return False
+    with open(file_path, "wb") as f:
+        f.write(new_content)
+    return True
 
 
-def format_duration(seconds: int) -> str:
+def format_duration(seconds: Optional[int]) -> str:
     if seconds is None:
         return ""
+    return _format_duration(int(seconds))
+
+
+@lru_cache(maxsize=4096)
+def _format_duration(seconds: int) -> str:
     minutes = seconds // 60
     hours = minutes // 60
     if hours == 0:
-        return "%02d:%02d" % (minutes, seconds % 60)
+        return f"{minutes:02d}:{seconds % 60:02d}"
     else:
-        return "%02d:%02d:%02d" % (hours, minutes % 60, seconds % 60)
+        return f"{hours:02d}:{minutes % 60:02d}:{seconds % 60:02d}"
@@ -17,27 +17,27 @@
 # top-level (generic) class for wrapping the payload.
 from schema import Payload, register_message_type
 
-# Every payload type needs a single definition. As currently written the clas
-# name needs to match the corresponding `type` value, but that can be changed
-# if needed.
+# Every payload type needs a single definition with a unique integer id, and
+# has to be registered so messages carrying it can be decoded. The example
+# payloads use ids 100-199, see rpc/schema.py.
 
 
 @register_message_type
-class EchoRequest(Payload):
+class EchoRequest(Payload, tag=100):
     message: str
 
 
 @register_message_type
-class EchoResponse(Payload):
+class EchoResponse(Payload, tag=101):
     echo: str
 
 
 @register_message_type
-class SumRequest(Payload):
+class SumRequest(Payload, tag=102):
     a: int
     b: int
 
 
 @register_message_type
-class SumResponse(Payload):
+class SumResponse(Payload, tag=103):
     result: int
@@ -15,18 +15,18 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 import asyncio
 import logging
-from typing import Any, Dict, Optional, TypeVar
+from typing import Any, Dict, Optional, TypeVar, cast
 
 import zmq
 import zmq.asyncio
+from zmq.error import ZMQError
 
-from .util import current_time_us, unique_id, ErrorHandlerFn
+from .util import unique_id, ErrorHandlerFn
 from .error import TimeoutException
 from .schema import (
     EmptyPayload,
     Message,
     Payload,
-    T,
     UnhandledApplicationError,
     decode,
     encode,
@@ -36,14 +36,21 @@ from .schema import (
 T = TypeVar("T", bound=Payload)
 
 
+async def _default_error_handler(request: Message, error: Message) -> None:
+    print(f"got error for {request}")
+    print(f"error: {error.payload}")
+
+
 class Client:
     def __init__(
         self, address: str, default_timeout: int = 2000, default_retries: int = 3
     ):
         self.address: str = address
         self.ctx = zmq.asyncio.Context.instance()
-        self.socket: Optional[zmq.asyncio.Socket] = self.ctx.socket(zmq.REQ)
-        self._responses: Dict[str, Any] = {}
+        self.socket: Optional[zmq.asyncio.Socket] = self._new_socket()
+        # requests in flight, keyed by msg_id
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._reader: Optional[asyncio.Task] = None
         self.default_timeout: int = default_timeout
         self.error_handler: Optional[ErrorHandlerFn] = None
         self.default_retries: int = default_retries
@@ -60,17 +67,39 @@ class Client:
         self.error_handler = error_handler
 
     def close(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+            self._reader = None
         if self.socket is not None:
-            self.socket.setsockopt(zmq.LINGER, 0)
             self.socket.close()
             self.socket = None
-            self._responses = {}
+
+    def _new_socket(self) -> zmq.asyncio.Socket:
+        socket = self.ctx.socket(zmq.DEALER)
+        # drop unsent messages on close, set up front so it also covers messages
+        # queued before the socket is torn down
+        socket.setsockopt(zmq.LINGER, 0)
+        # only queue messages once the server is connected, so requests are not
+        # held back and delivered after the caller has given up on them
+        socket.setsockopt(zmq.IMMEDIATE, 1)
+        return socket
 
     def _init(self) -> None:
-        self._responses: Dict[str, Any] = {}
-        self.socket = self.ctx.socket(zmq.REQ)
+        self.socket = self._new_socket()
         self.socket.connect(self.address)
 
+    async def _read_replies(self, socket: zmq.asyncio.Socket) -> None:
+        """Hand each reply to the request waiting for it, matched by msg_id."""
+        while True:
+            try:
+                frames = await socket.recv_multipart(copy=False)
+            except ZMQError:
+                return
+            rsp = decode(frames[-1].buffer)
+            future = self._pending.pop(rsp.msg_id, None)
+            if future is not None and not future.done():
+                future.set_result(rsp)
+
     async def dispatch(
         self,
         func_name,
@@ -79,65 +108,67 @@ class Client:
         retries: Optional[int] = None,
         error_handler: Optional[ErrorHandlerFn] = None,
     ) -> T:
-        await self._ensure_connected()
         _timeout = self.default_timeout if timeout is None else timeout
         _retries = self.default_retries if retries is None else retries
-        expire_at = current_time_us() + (_timeout * 1000)
-
-        async def _poll_data(data: Any) -> None:
-            """Implements lazy-pirate poll (see zmq guide chapter 4)"""
-            assert self.socket
-            await self.socket.send(data)
-            retries_left = _retries
-            while retries_left > 0:
-                if await self.socket.poll(_timeout):
-                    break
-                retries_left -= 1
-                logging.info(
-                    f"response from server timed out retries_left={retries_left}"
-                )
-                self.close()
-                await self._ensure_connected()
-                await self.socket.send(data)
 
-            if retries_left == 0:
+        async def _poll_data(req_id: str, data: Any) -> Message:
+            """Implements lazy-pirate poll (see zmq guide chapter 4)
+
+            The server handles every copy of a request it receives, so once the
+            message is sent the reply is waited for until the timeout. Only a
+            failed send is retried."""
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[req_id] = future
+            expire_at = loop.time() + _timeout / 1000
+            try:
+                retries_left = _retries
+                while retries_left > 0:
+                    await self._ensure_connected()
+                    assert self.socket
+                    try:
+                        # waits for the server to connect, see _new_socket
+                        await asyncio.wait_for(
+                            self.socket.send_multipart([b"", data]),
+                            expire_at - loop.time(),
+                        )
+                        return await asyncio.wait_for(
+                            asyncio.shield(future), expire_at - loop.time()
+                        )
+                    except asyncio.TimeoutError:
+                        break
+                    except ZMQError:
+                        retries_left -= 1
+                        logging.debug("socket in bad state, reconnecting")
+                        self.close()
+            finally:
+                self._pending.pop(req_id, None)
+
+            if not self._pending:
+                # nothing else is in flight, start over with a fresh socket so
+                # a request still queued for the server is never delivered
                 self.close()
-                logging.info(
-                    f"response from server timed out. retries exhausted. giving up."
-                )
-                raise TimeoutException(f"Timeout while sending message")
-            else:
-                data = await self.socket.recv()
-                rsp = decode(data)
-                self._responses[rsp.msg_id] = rsp
-
-        req_id = unique_id()
+            logging.info(
+                "response from server timed out. retries exhausted. giving up."
+            )
+            raise TimeoutException(f"Timeout while sending message")
+
         msg = Message(
-            func_name, req_id, payload if payload is not None else EmptyPayload()
+            func_name, unique_id(), payload if payload is not None else EmptyPayload()
         )
-        await _poll_data(encode(msg))
-
-        while req_id not in self._responses and current_time_us() <= expire_at:
-            await asyncio.sleep(1e-6)
-
-        # better late than never?
-        # if current_time_us() > expire_at:
-        #    raise TimeoutException(
-        #        f"Timeout while waiting for response at {self._address}"
-        #    )
-
-        rsp = self._responses.pop(req_id)
-        if (
-            hasattr(rsp.payload, "__class__")
-            and rsp.payload.__class__.__name__ == UnhandledApplicationError.__name__
-        ):
+        rsp = await _poll_data(msg.msg_id, encode(msg))
+        if isinstance(rsp.payload, UnhandledApplicationError):
             await self.handle_error(error_handler, msg, rsp)
-            return rsp.payload
-        return rsp.payload
+        # an UnhandledApplicationError is returned too, after the error handler
+        # has seen it, callers that care check for it with isinstance
+        return cast(T, rsp.payload)
 
     async def _ensure_connected(self) -> None:
         if self.socket is None:
             self._init()
+        assert self.socket
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.create_task(self._read_replies(self.socket))
 
     async def handle_error(
         self,
@@ -145,16 +176,5 @@ class Client:
         request: Message,
         error: Message,
     ) -> None:
-        async def default_error_handler(request: Message, error: Message) -> None:
-            print(f"got error for {request}")
-            print(f"error: {error.payload}")
-
-        error_handlers = [
-            endpoint_error_handler,
-            self.error_handler,
-            default_error_handler,
-        ]
-
-        handler = next(filter(lambda x: x is not None, error_handlers), None)
-        assert handler
+        handler = endpoint_error_handler or self.error_handler or _default_error_handler
         await handler(request, error)
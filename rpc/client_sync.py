@@ -14,7 +14,8 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 import logging
-from typing import Any, Dict, Optional, TypeVar
+import threading
+from typing import Dict, Optional, Set, TypeVar, cast
 
 import zmq
 from zmq.error import ZMQError
@@ -25,48 +26,74 @@ from .schema import (
     EmptyPayload,
     Message,
     Payload,
-    T,
     UnhandledApplicationError,
     decode,
-    encode,
+    encode_into,
 )
 
 
 T = TypeVar("T", bound=Payload)
 
 
+# longest a thread polls the shared socket before letting others use it, in ms
+_POLL_SLICE_MS = 10
+
+
+def _default_error_handler(request: Message, error: Message) -> None:
+    print(f"got error for {request}")
+    print(f"error: {error.payload}")
+
+
 class Client:
     def __init__(
         self, address: str, default_timeout: int = 2000, default_retries: int = 3
     ):
         self.address: str = address
         self.ctx = zmq.Context.instance()
-        self.socket: Optional[zmq.Socket] = self.ctx.socket(zmq.REQ)
-        self._responses: Dict[str, Any] = {}
+        self.socket: Optional[zmq.Socket] = self._new_socket()
         self.default_timeout: int = default_timeout
         self.error_handler: Optional[ErrorHandlerFn] = None
         self.default_retries: int = default_retries
+        # the socket is shared by every calling thread, all use of it holds the lock
+        self._lock = threading.RLock()
+        # requests in flight, and replies that arrived for them while another
+        # thread was reading
+        self._waiting: Set[str] = set()
+        self._replies: Dict[str, Message] = {}
+        # per thread buffer the outgoing request is encoded into, each thread
+        # only has one request in flight
+        self._local = threading.local()
 
     def connect(self) -> None:
-        self._init()
+        with self._lock:
+            self._init()
 
     def disconnect(self) -> None:
         assert self.socket
-        self.socket.disconnect(self.address)
+        with self._lock:
+            self.socket.disconnect(self.address)
 
     def set_error_handler(self, error_handler: ErrorHandlerFn) -> None:
         self.error_handler = error_handler
 
     def close(self) -> None:
-        if self.socket is not None:
-            self.socket.setsockopt(zmq.LINGER, 0)
-            self.socket.close()
-            self.socket = None
-            self._responses = {}
+        with self._lock:
+            if self.socket is not None:
+                self.socket.close()
+                self.socket = None
+
+    def _new_socket(self) -> zmq.Socket:
+        socket = self.ctx.socket(zmq.DEALER)
+        # drop unsent messages on close, set up front so it also covers messages
+        # queued before the socket is torn down
+        socket.setsockopt(zmq.LINGER, 0)
+        # only queue messages once the server is connected, so requests are not
+        # held back and delivered after the caller has given up on them
+        socket.setsockopt(zmq.IMMEDIATE, 1)
+        return socket
 
     def _init(self) -> None:
-        self._responses: Dict[str, Any] = {}
-        self.socket = self.ctx.socket(zmq.REQ)
+        self.socket = self._new_socket()
         self.socket.connect(self.address)
 
     def dispatch(
@@ -77,65 +104,99 @@ class Client:
         retries: Optional[int] = None,
         error_handler: Optional[ErrorHandlerFn] = None,
     ) -> T:
-        self._ensure_connected()
         _timeout = self.default_timeout if timeout is None else timeout
         _retries = self.default_retries if retries is None else retries
         expire_at = current_time_us() + (_timeout * 1000)
 
-        def _poll_data(data: Any) -> None:
-            """Implements lazy-pirate poll (see zmq guide chapter 4)"""
-            assert self.socket
-            failed_initial_send = False
-            try:
-                self.socket.send(data)
-            except ZMQError:
-                logging.debug("failed initial send, socket in bad state")
-                failed_initial_send = True
-            retries_left = _retries
-            while retries_left > 0:
-                if not failed_initial_send:
-                    if self.socket.poll(_timeout):
-                        break
-                retries_left -= 1
-                logging.info(
-                    f"response from server timed out retries_left={retries_left}"
-                )
-                self.close()
-                self._ensure_connected()
-                self.socket.send(data)
-                failed_initial_send = False
-
-            if retries_left == 0:
-                self.close()
-                logging.info(
-                    f"response from server timed out. retries exhausted. giving up."
-                )
-                raise TimeoutException(f"Timeout while sending message")
-            else:
-                data = self.socket.recv()
-                rsp = decode(data)
-                self._responses[rsp.msg_id] = rsp
-
-        req_id = unique_id()
         msg = Message(
-            func_name, req_id, payload if payload is not None else EmptyPayload()
+            func_name, unique_id(), payload if payload is not None else EmptyPayload()
         )
-        _poll_data(encode(msg))
-
-        # better late than never?
-        # if current_time_us() > expire_at:
-        #    raise TimeoutException(
-        #        f"Timeout while waiting for response at {self._address}"
-        #    )
-
-        rsp = self._responses.pop(req_id)
-        if (
-            hasattr(rsp.payload, "__class__")
-            and rsp.payload.__class__.__name__ == UnhandledApplicationError.__name__
-        ):
+        buf = getattr(self._local, "buf", None)
+        if buf is None:
+            buf = self._local.buf = bytearray()
+        rsp = self._poll_data(msg.msg_id, encode_into(msg, buf), expire_at, _retries)
+        if isinstance(rsp.payload, UnhandledApplicationError):
             self.handle_error(error_handler, msg, rsp)
-            return rsp.payload
-        return rsp.payload
+        # an UnhandledApplicationError is returned too, after the error handler
+        # has seen it, callers that care check for it with isinstance
+        return cast(T, rsp.payload)
+
+    def _poll_data(
+        self, req_id: str, data: bytearray, expire_at: int, retries: int
+    ) -> Message:
+        """Implements lazy-pirate poll (see zmq guide chapter 4)
+
+        The server handles every copy of a request it receives, so once the
+        message is sent the reply is waited for until expire_at (in us). Only a
+        failed send is retried."""
+        with self._lock:
+            self._waiting.add(req_id)
+        try:
+            retries_left = retries
+            while True:
+                if self._send(data, expire_at):
+                    rsp = self._wait_for(req_id, expire_at)
+                    if rsp is not None:
+                        return rsp
+                    break
+                retries_left -= 1
+                if retries_left <= 0 or current_time_us() >= expire_at:
+                    break
+                logging.info("failed to send request retries_left=%d", retries_left)
+        finally:
+            with self._lock:
+                self._waiting.discard(req_id)
+                self._replies.pop(req_id, None)
+
+        with self._lock:
+            if not self._waiting:
+                # nothing else is in flight, start over with a fresh socket so
+                # a request still queued for the server is never delivered
+                self.close()
+        logging.info("response from server timed out. retries exhausted. giving up.")
+        raise TimeoutException(f"Timeout while sending message")
+
+    def _send(self, data: bytearray, deadline: int) -> bool:
+        """Send data, waiting until deadline (in us) for the server to connect."""
+        while True:
+            with self._lock:
+                self._ensure_connected()
+                assert self.socket
+                try:
+                    self.socket.send_multipart([b"", data], flags=zmq.NOBLOCK)
+                    return True
+                except zmq.Again:
+                    remaining_ms = (deadline - current_time_us()) // 1000
+                    if remaining_ms <= 0:
+                        return False
+                    self.socket.poll(min(remaining_ms, _POLL_SLICE_MS), zmq.POLLOUT)
+                except ZMQError:
+                    logging.debug("failed send, socket in bad state")
+                    self.close()
+                    return False
+
+    def _wait_for(self, req_id: str, deadline: int) -> Optional[Message]:
+        """Wait until deadline (in us) for the reply to req_id.
+
+        The lock is only held for short polls, so other threads can send in
+        between, replies meant for them are set aside in _replies."""
+        while True:
+            with self._lock:
+                rsp = self._replies.pop(req_id, None)
+                if rsp is not None:
+                    return rsp
+                remaining_ms = (deadline - current_time_us()) // 1000
+                if remaining_ms <= 0 or self.socket is None:
+                    return None
+                if not self.socket.poll(min(remaining_ms, _POLL_SLICE_MS)):
+                    continue
+                frames = self.socket.recv_multipart(copy=False)
+                rsp = decode(frames[-1].buffer)
+                if rsp.msg_id == req_id:
+                    return rsp
+                if rsp.msg_id in self._waiting:
+                    self._replies[rsp.msg_id] = rsp
+                # otherwise it is a late reply to a request that gave up
 
     def _ensure_connected(self) -> None:
         if self.socket is None:
@@ -147,16 +208,5 @@ class Client:
         request: Message,
         error: Message,
     ) -> None:
-        def default_error_handler(request: Message, error: Message) -> None:
-            print(f"got error for {request}")
-            print(f"error: {error.payload}")
-
-        error_handlers = [
-            endpoint_error_handler,
-            self.error_handler,
-            default_error_handler,
-        ]
-
-        handler = next(filter(lambda x: x is not None, error_handlers), None)
-        assert handler
+        handler = endpoint_error_handler or self.error_handler or _default_error_handler
         handler(request, error)
@@ -15,31 +15,38 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 # In this version there's a different class per payload, but only a single
 # top-level (generic) class for wrapping the payload.
-from typing import Generic, Literal, Type, TypedDict, TypeVar
+from typing import Any, Dict, Generic, Optional, Type, TypeVar, Union, cast
 
 import msgspec
 
 
-class Payload(msgspec.Struct):
+# Payloads are plain data and never take part in reference cycles, so they are
+# not tracked by the garbage collector.
+class Payload(msgspec.Struct, tag_field="type", gc=False):
     pass
 
 
-# Every payload type needs a single definition. As currently written the clas
-# name needs to match the corresponding `type` value, but that can be changed
-# if needed.
+# Every payload type needs a single definition. Payloads are tagged structs, the
+# `type` field of an encoded payload holds the integer id of its class. Each
+# class declares its id with `tag=`, so the ids do not depend on which classes
+# a process happens to define or in what order. Ids are allocated per module:
+#   0-9      this module
+#   10-99    roon_proxy/schema.py
+#   100-199  rpc/app_msgs.py (examples)
+#   900-999  tests
 
 
-class EmptyPayload(Payload):
+class EmptyPayload(Payload, tag=0):
     pass
 
 
-class UnhandledApplicationError(Payload):
+class UnhandledApplicationError(Payload, tag=1):
     """Represents an error that occured (probably on the server side) that was not handled."""
 
     _exception: str
 
 
-class DeserializationError(Payload):
+class DeserializationError(Payload, tag=2):
     """Represents an error thar occured when deserializing a payload"""
 
     _exception: str
@@ -52,116 +59,92 @@ class DeserializationError(Payload):
 T = TypeVar("T", bound=Payload)
 
 
-class Message(Generic[T]):
+class Message(msgspec.Struct, Generic[T]):
     """A generic Message wrapper used for all payload types"""
 
     topic: str
     msg_id: str
     payload: T
 
-    def __init__(self, topic: str, msg_id: str, payload: T) -> None:
-        self.topic = topic
-        self.msg_id = msg_id
-        self.payload = payload
-
-    def __eq__(self, other):
-        return (
-            type(other) is Message
-            and self.topic == other.topic
-            and self.msg_id == other.msg_id
-            and self.payload == other.payload
-        )
-
-    def __repr__(self):
-        return f"Message(topic={self.topic!r}, msg_id={self.msg_id}, payload={self.payload!r})"
-
 
-# A lookup table of all possible Payload types. This uses `__subclasses__` to
-# automatically find all `Payload` subclasses. If this is too magical, you
-# could explicitly write out this mapping instead.
-_payload_class_lookup = {cls.__name__: cls for cls in Payload.__subclasses__()}
+# All registered Payload types, keyed by their tag. Messages are decoded as a
+# union of these.
+_payload_types: Dict[int, Type[Payload]] = {}
 
 
 def register_message_type(cls: Type[T]) -> Type[T]:
     """Decorator to register the message payload types"""
-    _payload_class_lookup[cls.__name__] = cls
+    global _decoder  # pylint: disable=global-statement
+    if not (isinstance(cls, type) and issubclass(cls, Payload)):
+        # only tagged Payload structs can be part of the decoded union
+        raise TypeError(f"{cls!r} is not a Payload subclass")
+    tag = cls.__struct_config__.tag
+    if not isinstance(tag, int):
+        raise TypeError(f"{cls!r} needs an integer id, declare it with tag=")
+    registered = _payload_types.get(tag)
+    if registered is not None and registered is not cls:
+        # a second class with the same id would silently replace the first in
+        # the decoder
+        raise ValueError(
+            f"Payload type {cls.__qualname__} reuses id {tag} of"
+            f" {registered.__qualname__}"
+        )
+    _payload_types[tag] = cls
+    _decoder = None
     return cls
 
 
-def is_empty_payload(payload: Payload) -> bool:
-    return payload.__class__.__name__ == EmptyPayload.__name__
-
+for _builtin in (EmptyPayload, UnhandledApplicationError, DeserializationError):
+    register_message_type(_builtin)
 
-def is_deserialize_error(payload: Payload) -> bool:
-    return payload.__class__.__name__ == DeserializationError.__name__
 
+def is_empty_payload(payload: Payload) -> bool:
+    return isinstance(payload, EmptyPayload)
 
-class _MessageSchema(TypedDict):
-    """A schema used for validating Message objects in `dec_hook` below"""
 
-    type: Literal[tuple(_payload_class_lookup)]  # type: ignore
-    topic: str
-    payload: str
-
-
-# `enc_hook` and `dec_hook` implementations for handling encoding/decoding of
-# the `Message` type.
-def enc_hook(x):
-    if isinstance(x, Message):
-        try:
-            return {
-                "type": type(x.payload).__name__,
-                "topic": x.topic,
-                "msg_id": x.msg_id,
-                "payload": msgspec.msgpack.encode(x.payload),
-            }
-        except TypeError as e:
-            print("TYPE ERROR ENCOUNTERED")
-            print(x)
-    raise TypeError(f"{type(x).__name__} is not supported")
-
-
-def dec_hook(type, data):
-    if type is Message:
-        # Use `from_builtins` to validate `data` matches the expected
-        # MessageSchema. This isn't strictly necessary, but does make
-        # it easier to raise a nicer error on an invalid `Message`
-        # print(f"dec_hook: _payload_class_lookup {data['type']} {payload_cls}")
-        # msg = msgspec.from_builtins(data, _MessageSchema)
-        # payload_cls = _payload_class_lookup[msg["type"]]
-        try:
-            payload_cls = _payload_class_lookup[data["type"]]
-            payload = msgspec.msgpack.decode(data["payload"], type=payload_cls)
-            return Message(data["topic"], data["msg_id"], payload)
-        except KeyError as e:
-            return Message(
-                data["topic"],
-                data["msg_id"],
-                DeserializationError(
-                    _exception=repr(e),
-                    message=f"Unknown payload type: {data['type']}",
-                    payload_type=data["type"],
-                    topic=data["topic"],
-                    msg_id=data["msg_id"],
-                ),
-            )
-        except msgspec.ValidationError as e:
-            return Message(
-                data["topic"],
-                data["msg_id"],
-                DeserializationError(
-                    _exception=repr(e),
-                    message=f"Payload type failed to deserialize {data['type']}",
-                    payload_type=data["type"],
-                    topic=data["topic"],
-                    msg_id=data["msg_id"],
-                ),
-            )
-    raise TypeError(f"{type} is not supported")
-
-
-_encoder = msgspec.msgpack.Encoder(enc_hook=enc_hook)
-_decoder = msgspec.msgpack.Decoder(Message, dec_hook=dec_hook)
+def is_deserialize_error(payload: Payload) -> bool:
+    return isinstance(payload, DeserializationError)
+
+
+_encoder = msgspec.msgpack.Encoder()
+_decoder: Optional[msgspec.msgpack.Decoder] = None
+
+
+def _get_decoder() -> msgspec.msgpack.Decoder:
+    global _decoder  # pylint: disable=global-statement
+    if _decoder is None:
+        payload_union = Union[tuple(_payload_types.values())]  # type: ignore
+        _decoder = msgspec.msgpack.Decoder(Message[payload_union])  # type: ignore
+    return _decoder
+
+
+def _deserialization_error(msg: bytes, exc: msgspec.ValidationError) -> Message:
+    """Wrap a message whose payload failed to decode in a DeserializationError"""
+    data: Any = msgspec.msgpack.decode(msg)
+    if not isinstance(data, dict):
+        raise exc
+    payload = data.get("payload")
+    type_id = payload.get("type") if isinstance(payload, dict) else None
+    payload_cls = _payload_types.get(type_id) if isinstance(type_id, int) else None
+    if payload_cls is None:
+        message = f"Unknown payload type: {type_id}"
+        payload_type = str(type_id)
+    else:
+        message = f"Payload type failed to deserialize {payload_cls.__name__}"
+        payload_type = payload_cls.__name__
+    topic = str(data.get("topic"))
+    msg_id = str(data.get("msg_id"))
+    return Message(
+        topic,
+        msg_id,
+        DeserializationError(
+            _exception=repr(exc),
+            message=message,
+            payload_type=payload_type,
+            topic=topic,
+            msg_id=msg_id,
+        ),
+    )
 
 
 # Functions for MSGPACK encoding & decoding a Message
@@ -169,5 +152,16 @@ def encode(x: Message) -> bytes:
     return _encoder.encode(x)
 
 
-def decode(msg: bytes) -> Message:
-    return _decoder.decode(msg)
+def encode_into(x: Message, buf: bytearray) -> bytearray:
+    """Encode into buf, replacing its contents, to reuse its allocation."""
+    _encoder.encode_into(x, buf)
+    return buf
+
+
+def decode(msg: Union[bytes, memoryview]) -> Message:
+    # msgspec decodes from any buffer, its stubs only admit bytes
+    buf = cast(bytes, msg)
+    try:
+        return _get_decoder().decode(buf)
+    except msgspec.ValidationError as e:
+        return _deserialization_error(buf, e)
@@ -13,8 +13,9 @@
 #
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import asyncio
 import logging
-from typing import Callable, Dict
+from typing import Callable, Dict, Set
 
 import zmq
 import zmq.asyncio
@@ -25,7 +26,7 @@ from .schema import (
     Payload,
     UnhandledApplicationError,
     decode,
-    encode,
+    encode_into,
     is_deserialize_error,
     is_empty_payload,
 )
@@ -34,6 +35,13 @@ from .schema import (
 class Server:
     def __init__(self):
         self._rpc_router: Dict[str, Callable] = {}
+        # requests being handled, referenced here so their tasks are not lost
+        self._tasks: Set[asyncio.Task] = set()
+        # msg_ids of the requests being handled, a client re-sending one of them
+        # must not run the handler a second time
+        self._in_flight: Set[str] = set()
+        # replies are encoded into this buffer while holding the send lock
+        self._send_buf = bytearray()
 
     def register_rpc(self, func: Callable) -> Callable:
         self._rpc_router[func.__name__] = func
@@ -51,37 +59,49 @@ class Server:
         return ret
 
     async def handle_client(self, socket):
+        # each request runs in its own task so a slow handler does not hold up
+        # the others, replies are sent one at a time
+        send_lock = asyncio.Lock()
         while True:
             try:
-                # Receive and decode a request
-                request_data = await socket.recv()
-
-                msg = decode(request_data)
-                req_id = msg.msg_id
-                func_name = msg.topic
-                payload = msg.payload
-                if is_deserialize_error(msg.payload):
-                    resp = msg.payload
-                    logging.exception("Deserialization error", resp)
-                else:
-                    logging.debug(f"{func_name}")
-                    resp = await self.handle_message(func_name, payload)
-                await socket.send(
-                    encode(
-                        Message(
-                            func_name,
-                            req_id,
-                            resp if resp is not None else EmptyPayload(),
-                        )
-                    )
-                )
+                # zero copy, the data is decoded straight from the frame buffer
+                frames = await socket.recv_multipart(copy=False)
             except EOFError:
                 print("Connection closed")
                 return
+            task = asyncio.create_task(self.handle_request(socket, send_lock, frames))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def handle_request(self, socket, send_lock: asyncio.Lock, frames) -> None:
+        # The frames before the data are the routing envelope of the client
+        *envelope, request_data = frames
+
+        msg = decode(request_data.buffer)
+        req_id = msg.msg_id
+        func_name = msg.topic
+        payload = msg.payload
+        if is_deserialize_error(msg.payload):
+            resp = msg.payload
+            logging.error("Deserialization error: %s", resp)
+        elif req_id in self._in_flight:
+            logging.debug("dropping duplicate request %s %s", func_name, req_id)
+            return
+        else:
+            logging.debug("%s", func_name)
+            self._in_flight.add(req_id)
+            try:
+                resp = await self.handle_message(func_name, payload)
+            finally:
+                self._in_flight.discard(req_id)
+        reply = Message(func_name, req_id, resp if resp is not None else EmptyPayload())
+        async with send_lock:
+            # the frames are copied when sent, so the buffer can be reused after
+            await socket.send_multipart([*envelope, encode_into(reply, self._send_buf)])
 
     async def run(self, address: str):
         ctx = zmq.asyncio.Context.instance()
-        socket = ctx.socket(zmq.REP)
+        socket = ctx.socket(zmq.ROUTER)
         socket.bind(address)
 
         await self.handle_client(socket)
@@ -5,11 +5,12 @@ from .schema import Message
 
 
 def unique_id() -> str:
-    return str(uuid.uuid4()).replace("-", "")
+    return uuid.uuid4().hex
 
 
 def current_time_us() -> int:
-    return int(time.time() * 1e6)
+    """Monotonic clock in microseconds, for deadlines."""
+    return time.monotonic_ns() // 1000
 
 
 ErrorHandlerFn = Callable[[Message, Message], Coroutine[Any, Any, None]]
@@ -0,0 +1,143 @@
+import asyncio
+import socket
+import threading
+import time
+import unittest
+
+from rpc.client_async import Client as AsyncClient
+from rpc.client_sync import Client
+from rpc.error import TimeoutException
+from rpc.schema import Payload, register_message_type
+from rpc.server import Server
+
+
+@register_message_type
+class RpcTestRequest(Payload, tag=910):
+    message: str
+    delay: float = 0
+
+
+@register_message_type
+class RpcTestResponse(Payload, tag=911):
+    echo: str
+
+
+def free_address() -> str:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return f"tcp://127.0.0.1:{s.getsockname()[1]}"
+
+
+class TestSyncClient(unittest.TestCase):
+    def setUp(self):
+        self.address = free_address()
+        self.calls = []
+        self.server = Server()
+
+        @self.server.register_rpc
+        async def echo(request: RpcTestRequest) -> RpcTestResponse:
+            self.calls.append(request.message)
+            await asyncio.sleep(request.delay)
+            return RpcTestResponse(echo=request.message)
+
+        self.loop = asyncio.new_event_loop()
+        self.server_thread = None
+        self.client = Client(self.address)
+        self.client.connect()
+
+    def tearDown(self):
+        self.client.close()
+        if self.server_thread is not None:
+            self.loop.call_soon_threadsafe(self.server_task.cancel)
+            self.server_thread.join()
+        self.loop.close()
+
+    def start_server(self):
+        started = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(self.loop)
+            self.server_task = self.loop.create_task(self.server.run(self.address))
+            self.loop.call_soon(started.set)
+            try:
+                self.loop.run_until_complete(self.server_task)
+            except asyncio.CancelledError:
+                pass
+
+        self.server_thread = threading.Thread(target=run)
+        self.server_thread.start()
+        started.wait()
+
+    def test_slow_handler_runs_once(self):
+        self.start_server()
+        rsp = self.client.dispatch("echo", RpcTestRequest("slow", delay=1.0))
+        self.assertEqual(rsp.echo, "slow")
+        self.assertEqual(self.calls, ["slow"])
+
+    def test_no_delivery_after_timeout(self):
+        with self.assertRaises(TimeoutException):
+            self.client.dispatch("echo", RpcTestRequest("lost"), timeout=600)
+        self.start_server()
+        rsp = self.client.dispatch("echo", RpcTestRequest("after"))
+        self.assertEqual(rsp.echo, "after")
+        time.sleep(0.5)
+        self.assertEqual(self.calls, ["after"])
+
+    def test_concurrent_threads_get_own_replies(self):
+        self.start_server()
+        results = {}
+
+        def call(i: int):
+            # the longest request is sent first so replies arrive out of order
+            rsp = self.client.dispatch(
+                "echo", RpcTestRequest(str(i), delay=(8 - i) * 0.05)
+            )
+            results[i] = rsp.echo
+
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+            time.sleep(0.01)
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, {i: str(i) for i in range(8)})
+
+
+class TestAsyncClient(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.address = free_address()
+        self.calls = []
+        self.server = Server()
+
+        @self.server.register_rpc
+        async def echo(request: RpcTestRequest) -> RpcTestResponse:
+            self.calls.append(request.message)
+            await asyncio.sleep(request.delay)
+            return RpcTestResponse(echo=request.message)
+
+        self.server_task = None
+        self.client = AsyncClient(self.address)
+        self.client.connect()
+
+    async def asyncTearDown(self):
+        self.client.close()
+        if self.server_task is not None:
+            self.server_task.cancel()
+
+    def start_server(self):
+        self.server_task = asyncio.create_task(self.server.run(self.address))
+
+    async def test_slow_handler_runs_once(self):
+        self.start_server()
+        rsp = await self.client.dispatch("echo", RpcTestRequest("slow", delay=1.0))
+        self.assertEqual(rsp.echo, "slow")
+        self.assertEqual(self.calls, ["slow"])
+
+    async def test_no_delivery_after_timeout(self):
+        with self.assertRaises(TimeoutException):
+            await self.client.dispatch("echo", RpcTestRequest("lost"), timeout=600)
+        self.start_server()
+        rsp = await self.client.dispatch("echo", RpcTestRequest("after"))
+        self.assertEqual(rsp.echo, "after")
+        await asyncio.sleep(0.5)
+        self.assertEqual(self.calls, ["after"])
@@ -0,0 +1,91 @@
+import subprocess
+import sys
+import textwrap
+import unittest
+from pathlib import Path
+
+import msgspec
+
+from roon_proxy.const import ItemType
+from roon_proxy.schema import GetImageReply, SearchType
+from rpc.schema import (
+    DeserializationError,
+    Message,
+    Payload,
+    decode,
+    encode,
+    register_message_type,
+)
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def encode_in_other_process(source: str) -> bytes:
+    """Run source in a fresh interpreter and return the bytes it writes."""
+    out = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(source)],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+    )
+    return bytes.fromhex(out.stdout.decode().strip())
+
+
+class TestPayloadIds(unittest.TestCase):
+    def test_decode_message_encoded_in_other_process(self):
+        # the other side defines payload classes this side does not know about
+        # before the shared schema, that must not shift the ids of the others
+        data = encode_in_other_process(
+            """
+            from rpc.schema import Payload, Message, encode
+
+            class OnlyOnThisSide(Payload, tag=900):
+                pass
+
+            class NotRegistered(Payload):
+                pass
+
+            from roon_proxy.schema import GetImageReply
+
+            print(encode(Message("get_image", "1", GetImageReply(url="u"))).hex())
+            """
+        )
+        msg = decode(data)
+        self.assertEqual(msg, Message("get_image", "1", GetImageReply(url="u")))
+
+    def test_unknown_id_is_a_deserialization_error(self):
+        data = encode_in_other_process(
+            """
+            from rpc.schema import Payload, Message, encode, register_message_type
+
+            @register_message_type
+            class OnlyOnThisSide(Payload, tag=901):
+                pass
+
+            print(encode(Message("x", "2", OnlyOnThisSide())).hex())
+            """
+        )
+        msg = decode(data)
+        self.assertIsInstance(msg.payload, DeserializationError)
+        self.assertEqual(msg.payload.payload_type, "901")
+        self.assertEqual(msg.msg_id, "2")
+
+    def test_round_trip(self):
+        msg = Message("search_type", "3", SearchType(ItemType.ARTIST, "a"))
+        self.assertEqual(decode(encode(msg)), msg)
+        raw = msgspec.msgpack.decode(encode(msg))
+        self.assertEqual(raw["payload"]["type"], SearchType.__struct_config__.tag)
+
+    def test_register_requires_integer_id(self):
+        class NoId(Payload):
+            pass
+
+        with self.assertRaises(TypeError):
+            register_message_type(NoId)
+
+    def test_register_rejects_reused_id(self):
+        class ReusedId(Payload, tag=GetImageReply.__struct_config__.tag):
+            pass
+
+        with self.assertRaises(ValueError):
+            register_message_type(ReusedId)
@@ -1,6 +1,6 @@
 import pytest
 import unittest
-from fuzzywuzzy import fuzz, process as fuzz_process
+from rapidfuzz import fuzz, process as fuzz_process
 
 import util
 